@@ -78,7 +78,8 @@ resource "aws_iam_role_policy" "ssm_rds_scheduler" {
         Action = [
           "rds:DescribeDBClusters",
           "rds:DescribeDBInstances",
-          "rds:ListTagsForResource"
+          "rds:ListTagsForResource",
+          "tag:GetResources"
         ]
         Resource = "*"
       }
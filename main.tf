@@ -79,6 +79,7 @@ resource "aws_ssm_association" "start_aurora_clusters" {
     AutomationAssumeRole = var.automation_role_arn
     Action               = "Start"
     ScheduleTagKey       = var.schedule_tag_key
+    LogLevel             = var.aurora_log_level
   }
   # "ParameterValues" passes a literal value rather than performing a resource lookup, so SSM runs the automation once (not once-per-resource). The script ignores TargetKey
   targets {
@@ -99,6 +100,7 @@ resource "aws_ssm_association" "stop_aurora_clusters" {
     AutomationAssumeRole = var.automation_role_arn
     Action               = "Stop"
     ScheduleTagKey       = var.schedule_tag_key
+    LogLevel             = var.aurora_log_level
   }
   # "ParameterValues" passes a literal value rather than performing a resource lookup, so SSM runs the automation once (not once-per-resource). The script ignores TargetKey
   targets {
@@ -140,6 +142,12 @@ resource "aws_ssm_document" "aurora_cluster_scheduler" {
         description = "The tag key used to identify opt-in clusters."
         default     = "Schedule"
       }
+      LogLevel = {
+        type          = "String"
+        description   = "Script log level. WARNING logs only warnings and failed clusters."
+        default       = "INFO"
+        allowedValues = ["DEBUG", "INFO", "WARNING", "ERROR"]
+      }
       TargetKey = {
         type        = "StringList"
         description = "Reserved — not used by the script. Required by the SSM UpdateAssociation API when automation_target_parameter_name is set."
@@ -158,6 +166,7 @@ resource "aws_ssm_document" "aurora_cluster_scheduler" {
           InputPayload = {
             Action         = "{{Action}}"
             ScheduleTagKey = "{{ScheduleTagKey}}"
+            LogLevel       = "{{LogLevel}}"
           }
         }
         outputs = [
@@ -13,11 +13,36 @@ Cluster eligibility (matching PoC logic):
 """
 
 import boto3
-import time
+import json
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.config import Config
+
+# Logging convention: pass arguments as %-style placeholders, never f-strings,
+# so formatting is skipped when the level is disabled. Wrap any other costly
+# argument building (e.g. json.dumps) in logger.isEnabledFor().
+# The level comes from the document's LogLevel parameter (see handler), or
+# the LOG_LEVEL environment variable when run outside SSM. WARNING emits only
+# warnings and failed-cluster records.
+# Keep in sync with the LogLevel allowedValues in main.tf and var.aurora_log_level.
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+DEFAULT_LOG_LEVEL = "INFO"
 
 logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+
+
+def resolve_log_level(value):
+    """Return a valid level name, falling back to INFO for unknown values."""
+    level = (value or DEFAULT_LOG_LEVEL).upper()
+    if level not in LOG_LEVELS:
+        logger.warning("Unknown log level '%s' — using %s.", value, DEFAULT_LOG_LEVEL)
+        return DEFAULT_LOG_LEVEL
+    return level
+
+
+logger.setLevel(resolve_log_level(os.environ.get("LOG_LEVEL")))
 
 # ---------------------------------------------------------------------------
 # Constants
@@ -30,19 +55,75 @@ STATUS_STOPPED = "stopped"
 STATUS_STARTING = "starting"
 STATUS_STOPPING = "stopping"
 
-UNSTOPPABLE_ENGINE_MODES = {"global", "parallelquery", "multimaster", "serverless"}
-
-MAX_RETRIES = 3
-RETRY_DELAY_SECONDS = 5
+# Per-action dispatch, resolved once per invocation rather than per cluster.
+# skip_states: already in (or moving to) the target state — nothing to do.
+# required:    the only state the action can be issued from.
+ACTION_PRECHECKS = {
+    ACTION_START: {"skip_states": (STATUS_AVAILABLE, STATUS_STARTING), "required": STATUS_STOPPED},
+    ACTION_STOP: {"skip_states": (STATUS_STOPPED, STATUS_STOPPING), "required": STATUS_AVAILABLE},
+}
+ACTION_API_METHODS = {
+    ACTION_START: "start_db_cluster",
+    ACTION_STOP: "stop_db_cluster",
+}
+
+UNSTOPPABLE_ENGINE_MODES = frozenset({"global", "parallelquery", "multimaster", "serverless"})
+
+# Passed as a DescribeDBClusters filter so non-Aurora clusters are dropped server-side.
+AURORA_ENGINES = ["aurora-mysql", "aurora-postgresql", "aurora"]
+
+# Transient API errors are retried by botocore's "standard" retry mode
+# (exponential backoff with jitter), configured on the clients.
+# InvalidDBClusterStateFault is not retryable and surfaces immediately.
+MAX_ATTEMPTS = 5
+
+# Per-cluster API calls are independent, so they run on a bounded thread pool.
+# The connection pool is sized above the worker count so urllib3 doesn't
+# serialise concurrent requests.
+MAX_WORKERS = 16
+MAX_POOL_CONNECTIONS = 32
+
+CLIENT_CONFIG = Config(
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    retries={"max_attempts": MAX_ATTEMPTS, "mode": "standard"},
+)
+
+# Clients are kept at module scope so warm invocations in a reused runtime
+# skip client construction. Discovered clusters are never cached: decisions
+# depend on each cluster's current Status.
+_CLIENTS = {}
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
+def get_client(service_name):
+    """Return a boto3 client for the service, reused across invocations."""
+    client = _CLIENTS.get(service_name)
+    if client is None:
+        client = boto3.client(service_name, config=CLIENT_CONFIG)
+        _CLIENTS[service_name] = client
+    return client
+
+
+def discover_cluster_pages(rds_client):
+    """
+    Yield Aurora clusters in the region one DescribeDBClusters page at a
+    time, so callers can start work before pagination finishes.
+    """
+    paginator = rds_client.get_paginator("describe_db_clusters")
+    total = 0
+    for page in paginator.paginate(Filters=[{"Name": "engine", "Values": AURORA_ENGINES}]):
+        total += len(page["DBClusters"])
+        yield page["DBClusters"]
+    logger.info("Found %d Aurora clusters.", total)
+
+
 def is_multi_az_db_cluster(cluster):
     """
     Multi-AZ DB Clusters (non-Aurora) have a DBClusterInstanceClass field
     that Aurora clusters lack. These cannot be stopped.
+    Discovery already filters to Aurora engines; this is a defensive check.
     """
     engine = cluster.get("Engine", "")
     has_instance_class = "DBClusterInstanceClass" in cluster
@@ -52,7 +133,7 @@ def is_multi_az_db_cluster(cluster):
 def is_stoppable_cluster(cluster):
     """Return True if the cluster type supports stop/start."""
     cluster_id = cluster["DBClusterIdentifier"]
-    engine_mode = cluster.get("EngineMode", "provisioned").lower()
+    engine_mode = cluster.get("EngineMode", "provisioned")
 
     if engine_mode in UNSTOPPABLE_ENGINE_MODES:
         logger.info(
@@ -71,85 +152,108 @@ def is_stoppable_cluster(cluster):
     return True
 
 
+def get_tagged_cluster_arns(tagging_client, tag_key):
+    """
+    Return the set of cluster ARNs carrying the opt-in tag, using a single
+    paginated Resource Groups Tagging API lookup instead of one
+    ListTagsForResource call per cluster.
+
+    Returns None if the lookup fails, so callers can fall back to
+    has_schedule_tag.
+    """
+    tagged_arns = set()
+    kwargs = {
+        "TagFilters": [{"Key": tag_key}],
+        "ResourceTypeFilters": ["rds:cluster"],
+    }
+    try:
+        while True:
+            response = tagging_client.get_resources(**kwargs)
+            for mapping in response.get("ResourceTagMappingList", []):
+                tagged_arns.add(mapping["ResourceARN"])
+            token = response.get("PaginationToken")
+            if not token:
+                break
+            kwargs["PaginationToken"] = token
+    except Exception as exc:
+        logger.warning(
+            "Failed to look up tagged clusters via tagging API: %s. "
+            "Falling back to per-cluster tag lookups.",
+            exc,
+        )
+        return None
+    return tagged_arns
+
+
 def has_schedule_tag(rds_client, cluster_arn, tag_key):
-    """Check whether the cluster has the opt-in tag."""
+    """
+    Check whether the cluster has the opt-in tag.
+    Fallback for when get_tagged_cluster_arns is unavailable.
+    """
     try:
         tags = rds_client.list_tags_for_resource(ResourceName=cluster_arn)["TagList"]
-        return any(tag["Key"] == tag_key for tag in tags)
+        return tag_key in {tag["Key"] for tag in tags}
     except Exception as exc:
         logger.warning("Failed to list tags for '%s': %s. Skipping.", cluster_arn, exc)
         return False
 
 
-def perform_action_with_retry(rds_client, cluster_id, action):
-    """
-    Execute start/stop with retry for transient errors.
-    InvalidDBClusterStateFault is not retried — it won't resolve by retrying.
-    """
-    api_call = (
-        rds_client.start_db_cluster
-        if action == ACTION_START
-        else rds_client.stop_db_cluster
-    )
+def perform_action(api_call, cluster_id):
+    """Issue start/stop via the bound client method and return the new status."""
+    response = api_call(DBClusterIdentifier=cluster_id)
+    return response["DBCluster"]["Status"]
 
-    last_exception = None
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            api_call(DBClusterIdentifier=cluster_id)
-            time.sleep(1)
-            response = rds_client.describe_db_clusters(DBClusterIdentifier=cluster_id)
-            new_status = response["DBClusters"][0]["Status"]
-            logger.info(
-                "Action '%s' succeeded on '%s' (attempt %d). New status: %s",
-                action, cluster_id, attempt, new_status,
-            )
-            return new_status
-        except rds_client.exceptions.InvalidDBClusterStateFault:
-            raise
-        except Exception as exc:
-            last_exception = exc
-            logger.warning(
-                "Attempt %d/%d failed for '%s' on '%s': %s",
-                attempt, MAX_RETRIES, action, cluster_id, exc,
-            )
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY_SECONDS)
 
-    raise last_exception
+def log_outcome(result, action):
+    """
+    Emit one structured JSON record for a cluster's outcome. One record per
+    cluster keeps CloudWatch ingestion down; failures are logged at ERROR.
+    """
+    level = logging.ERROR if result["outcome"] == "failed" else logging.INFO
+    if logger.isEnabledFor(level):
+        logger.log(level, "%s", json.dumps({
+            "cluster": result["cluster_id"],
+            "action": action,
+            "status": result["status"],
+            "outcome": result["outcome"],
+            "message": result["message"],
+        }, ensure_ascii=False))
+
+
+def process_cluster_if_tagged(rds_client, api_call, cluster, action, tag_key):
+    """
+    Fallback used when the tagging API lookup fails: check the cluster's tags
+    and process it if opted in. Returns None for untagged clusters.
+    """
+    if not has_schedule_tag(rds_client, cluster["DBClusterArn"], tag_key):
+        return None
+    return process_cluster(api_call, cluster, action)
 
 
-def process_cluster(rds_client, cluster_id, action):
+def process_cluster(api_call, cluster, action):
     """
     Process a single cluster. Returns outcome: processed, skipped, or failed.
+    The status is read from the cluster dict already fetched during discovery.
+    The outcome is logged here, on the worker, as soon as the cluster is done.
     """
+    cluster_id = cluster["DBClusterIdentifier"]
     result = {"cluster_id": cluster_id, "outcome": "failed", "message": "", "status": ""}
+    precheck = ACTION_PRECHECKS[action]
 
     try:
-        response = rds_client.describe_db_clusters(DBClusterIdentifier=cluster_id)
-        current_status = response["DBClusters"][0]["Status"]
+        current_status = cluster["Status"]
         result["status"] = current_status
 
-        if action == ACTION_START:
-            if current_status in (STATUS_AVAILABLE, STATUS_STARTING):
-                result["outcome"] = "skipped"
-                result["message"] = f"Already '{current_status}' — no action needed."
-                return result
-            if current_status != STATUS_STOPPED:
-                result["outcome"] = "skipped"
-                result["message"] = f"Cannot start from '{current_status}' state."
-                return result
-
-        elif action == ACTION_STOP:
-            if current_status in (STATUS_STOPPED, STATUS_STOPPING):
-                result["outcome"] = "skipped"
-                result["message"] = f"Already '{current_status}' — no action needed."
-                return result
-            if current_status != STATUS_AVAILABLE:
-                result["outcome"] = "skipped"
-                result["message"] = f"Cannot stop from '{current_status}' state."
-                return result
-
-        new_status = perform_action_with_retry(rds_client, cluster_id, action)
+        if current_status in precheck["skip_states"]:
+            result["outcome"] = "skipped"
+            result["message"] = f"Already '{current_status}' — no action needed."
+            return result
+        if current_status != precheck["required"]:
+            result["outcome"] = "skipped"
+            result["message"] = f"Cannot {action} from '{current_status}' state."
+            return result
+
+        new_status = perform_action(api_call, cluster_id)
         result["outcome"] = "processed"
         result["status"] = new_status
         result["message"] = f"Action '{action}' initiated successfully."
@@ -157,7 +261,9 @@ def process_cluster(rds_client, cluster_id, action):
     except Exception as exc:
         result["outcome"] = "failed"
         result["message"] = str(exc)
-        logger.error("Failed to %s cluster '%s': %s", action, cluster_id, exc)
+
+    finally:
+        log_outcome(result, action)
 
     return result
 
@@ -169,55 +275,83 @@ def handler(event, context):
     """
     SSM Automation aws:executeScript entry point.
 
-    Input:  Action ("Start" or "Stop"), ScheduleTagKey (default "Schedule")
+    Input:  Action ("Start" or "Stop"), ScheduleTagKey (default "Schedule"),
+            LogLevel (optional, e.g. "WARNING")
     Output: ProcessedClusters, SkippedClusters, FailedClusters
     """
+    # Set on every call so one run's LogLevel doesn't leak into the next
+    # warm invocation.
+    logger.setLevel(resolve_log_level(event.get("LogLevel") or os.environ.get("LOG_LEVEL")))
+
     action = event.get("Action", "").lower()
     tag_key = event.get("ScheduleTagKey", "Schedule")
 
-    if action not in (ACTION_START, ACTION_STOP):
+    if action not in ACTION_PRECHECKS:
         raise ValueError(f"Invalid Action '{event.get('Action')}'. Must be 'Start' or 'Stop'.")
 
-    rds_client = boto3.client("rds")
+    rds_client = get_client("rds")
+    tagging_client = get_client("resourcegroupstaggingapi")
+    api_call = getattr(rds_client, ACTION_API_METHODS[action])
 
-    # Step 1: Discover all clusters
+    # Step 1: Look up which clusters carry the opt-in tag
     logger.info("Discovering clusters with tag '%s'...", tag_key)
-    paginator = rds_client.get_paginator("describe_db_clusters")
-    all_clusters = []
-    for page in paginator.paginate():
-        all_clusters.extend(page["DBClusters"])
-    logger.info("Found %d total clusters.", len(all_clusters))
-
-    # Step 2: Filter to eligible tagged clusters
-    eligible = []
-    for cluster in all_clusters:
-        if not is_stoppable_cluster(cluster):
-            continue
-        if not has_schedule_tag(rds_client, cluster["DBClusterArn"], tag_key):
-            continue
-        eligible.append(cluster["DBClusterIdentifier"])
-
-    logger.info("Found %d eligible clusters: %s", len(eligible), eligible)
+    tagged_arns = get_tagged_cluster_arns(tagging_client, tag_key)
 
-    # Step 3: Process each cluster
+    # Step 2: Discover Aurora clusters page by page, submitting candidate
+    # clusters for processing while the next page is fetched. In fallback
+    # mode every stoppable cluster is submitted and its tags checked on the
+    # worker, so eligibility is only known once outcomes are collected.
     processed, skipped, failed = [], [], []
+    eligible = []
+    discovery_error = None
 
-    for cluster_id in eligible:
-        result = process_cluster(rds_client, cluster_id, action)
-        logger.info("Cluster '%s': %s — %s", cluster_id, result["outcome"], result["message"])
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = []
+        # A later page can fail after earlier clusters were already actioned;
+        # those outcomes are still collected and reported before re-raising.
+        try:
+            for clusters in discover_cluster_pages(rds_client):
+                for cluster in clusters:
+                    if not is_stoppable_cluster(cluster):
+                        continue
+                    if tagged_arns is None:
+                        futures.append(executor.submit(
+                            process_cluster_if_tagged, rds_client, api_call, cluster, action, tag_key,
+                        ))
+                    elif cluster["DBClusterArn"] in tagged_arns:
+                        futures.append(executor.submit(process_cluster, api_call, cluster, action))
+        except Exception as exc:
+            discovery_error = exc
+
+        # Step 3: Collect outcomes in discovery order (calls still run concurrently)
+        for future in futures:
+            result = future.result()
+            if result is None:
+                continue
+            cluster_id = result["cluster_id"]
+            eligible.append(cluster_id)
+            if result["outcome"] == "processed":
+                processed.append(cluster_id)
+            elif result["outcome"] == "skipped":
+                skipped.append(cluster_id)
+            else:
+                failed.append(cluster_id)
 
-        if result["outcome"] == "processed":
-            processed.append(cluster_id)
-        elif result["outcome"] == "skipped":
-            skipped.append(cluster_id)
-        else:
-            failed.append(cluster_id)
+    logger.info("Found %d eligible clusters: %s", len(eligible), eligible)
+    if discovery_error is not None:
+        logger.error(
+            "Cluster discovery failed after %d eligible clusters were found: %s",
+            len(eligible), discovery_error,
+        )
 
     logger.info(
         "Done. Action=%s | Processed=%d | Skipped=%d | Failed=%d",
         action, len(processed), len(skipped), len(failed),
     )
 
+    if discovery_error is not None:
+        raise discovery_error
+
     return {
         "ProcessedClusters": processed,
         "SkippedClusters": skipped,
@@ -239,6 +239,11 @@ run "role_arn_passed_to_all_associations" {
     condition     = aws_ssm_association.stop_aurora_clusters["MON"].parameters["AutomationAssumeRole"] == "arn:aws:iam::123456789012:role/test-role"
     error_message = "Stop Aurora clusters must have the role ARN"
   }
+
+  assert {
+    condition     = aws_ssm_association.start_aurora_clusters["MON"].parameters["LogLevel"] == "INFO"
+    error_message = "Aurora associations should pass the default LogLevel to the script"
+  }
 }
 
 
@@ -1,6 +1,5 @@
 import importlib.util
 import pathlib
-import types
 import sys
 from types import SimpleNamespace
 
@@ -29,6 +28,23 @@ def load_module():
         # provide a default client factory; tests will monkeypatch as needed
         fake_boto3.client = lambda *args, **kwargs: None
         sys.modules["boto3"] = fake_boto3
+    # Likewise provide a dummy botocore.config.Config when botocore isn't installed
+    try:
+        import botocore.config  # noqa: F401
+    except ImportError:
+        import types as _types
+
+        fake_botocore = _types.ModuleType("botocore")
+        fake_botocore_config = _types.ModuleType("botocore.config")
+
+        class FakeConfig:
+            def __init__(self, **kwargs):
+                self.__dict__.update(kwargs)
+
+        fake_botocore_config.Config = FakeConfig
+        fake_botocore.config = fake_botocore_config
+        sys.modules.setdefault("botocore", fake_botocore)
+        sys.modules["botocore.config"] = fake_botocore_config
 
     spec.loader.exec_module(module)
     return module
@@ -144,9 +160,46 @@ def test_has_schedule_tag_unexpected_shape(monkeypatch):
     assert mod.has_schedule_tag(BadShapeClient(), "arn:1", "Schedule") is False
 
 
-def test_perform_action_with_retry_success(monkeypatch):
-    # Objective: ensure perform_action_with_retry calls API and returns new status on success
-    # Setup: FakeClient implements start_db_cluster and describe_db_clusters returning 'starting'
+def test_get_tagged_cluster_arns_paginates(monkeypatch):
+    # Objective: ensure tagged cluster ARNs are collected across all tagging API pages
+    # Setup: FakeTaggingClient returns two pages linked by PaginationToken
+    # Expected: get_tagged_cluster_arns returns ARNs from both pages and passes the tag filter through
+    mod = load_module()
+
+    class FakeTaggingClient:
+        def __init__(self):
+            self.calls = []
+
+        def get_resources(self, **kwargs):
+            self.calls.append(kwargs)
+            if "PaginationToken" not in kwargs:
+                return {"ResourceTagMappingList": [{"ResourceARN": "arn:1"}], "PaginationToken": "next"}
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:2"}], "PaginationToken": ""}
+
+    fake = FakeTaggingClient()
+    assert mod.get_tagged_cluster_arns(fake, "Schedule") == {"arn:1", "arn:2"}
+    assert len(fake.calls) == 2
+    assert fake.calls[0]["TagFilters"] == [{"Key": "Schedule"}]
+    assert fake.calls[0]["ResourceTypeFilters"] == ["rds:cluster"]
+    assert fake.calls[1]["PaginationToken"] == "next"
+
+
+def test_get_tagged_cluster_arns_failure_returns_none(monkeypatch):
+    # Objective: ensure tagging API failures signal the caller to fall back
+    # Setup: FakeTaggingClient.get_resources raises an exception
+    # Expected: get_tagged_cluster_arns returns None rather than raising
+    mod = load_module()
+
+    class BadTaggingClient:
+        def get_resources(self, **kwargs):
+            raise RuntimeError("boom")
+
+    assert mod.get_tagged_cluster_arns(BadTaggingClient(), "Schedule") is None
+
+
+def test_perform_action_success(monkeypatch):
+    # Objective: ensure perform_action calls API and returns new status on success
+    # Setup: FakeClient.start_db_cluster returns a DBCluster with Status 'starting'
     # Expected: function returns 'starting' without raising
     mod = load_module()
 
@@ -162,59 +215,58 @@ def test_perform_action_with_retry_success(monkeypatch):
             # Accept the AWS 'DBClusterIdentifier' kwarg name as well
             _ = db_cluster_identifier if db_cluster_identifier is not None else kwargs.get("DBClusterIdentifier")
             self.calls += 1
-
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier if db_cluster_identifier is not None else kwargs.get("DBClusterIdentifier")
-            return {"DBClusters": [{"Status": "starting"}]}
+            return {"DBCluster": {"Status": "starting"}}
 
     fake = FakeClient()
-    monkeypatch.setattr(mod, "time", types.SimpleNamespace(sleep=lambda *_: None))
-    status = mod.perform_action_with_retry(fake, "c1", mod.ACTION_START)
+    status = mod.perform_action(fake.start_db_cluster, "c1")
     assert status == "starting"
 
 
-def test_perform_action_with_retry_transient_then_success(monkeypatch):
-    # Objective: validate transient errors are retried and eventual success returns status
-    # Setup: FakeClient raises transient Exception on first two start attempts, succeeds on third
-    # Expected: perform_action_with_retry returns 'starting'
+def test_handler_configures_standard_retry_mode(monkeypatch):
+    # Objective: ensure transient-error retries are delegated to botocore's standard retry mode
+    # Setup: boto3.client patched to record the config it is created with; no clusters discovered
+    # Expected: both clients use retries mode 'standard' with MAX_ATTEMPTS
     mod = load_module()
 
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": []}
+
     class FakeClient:
-        def __init__(self):
-            self.calls = 0
+        def get_paginator(self, name):
+            return Paginator()
 
-        class exceptions:
-            class InvalidDBClusterStateFault(Exception):
-                pass
+        def start_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "starting"}}
 
-        def start_db_cluster(self, db_cluster_identifier=None, **kwargs):
-            # Accept the AWS 'DBClusterIdentifier' kwarg name as well
-            _ = db_cluster_identifier if db_cluster_identifier is not None else kwargs.get("DBClusterIdentifier")
-            self.calls += 1
-            if self.calls < 3:
-                # Use a specific exception type for transient failures
-                raise RuntimeError("transient")
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
 
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier if db_cluster_identifier is not None else kwargs.get("DBClusterIdentifier")
-            return {"DBClusters": [{"Status": "starting"}]}
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": []}
 
-    fake = FakeClient()
-    monkeypatch.setattr(mod, "time", types.SimpleNamespace(sleep=lambda *_: None))
-    status = mod.perform_action_with_retry(fake, "c1", mod.ACTION_START)
-    assert status == "starting"
+    configs = {}
+
+    def fake_client(service, config=None, **kwargs):
+        configs[service] = config
+        return FakeClient()
+
+    monkeypatch.setattr(mod.boto3, "client", fake_client)
+    mod.handler({"Action": "Start"}, None)
 
+    for service in ("rds", "resourcegroupstaggingapi"):
+        assert configs[service].retries == {"max_attempts": mod.MAX_ATTEMPTS, "mode": "standard"}
 
-def test_perform_action_with_retry_transient_fail(monkeypatch):
-    # Objective: verify repeated transient failures propagate the last exception
+
+def test_perform_action_error_propagates(monkeypatch):
+    # Objective: verify errors surfaced by the client propagate without a local retry loop
     # Setup: FakeClient always raises Exception from start_db_cluster
-    # Expected: perform_action_with_retry raises the same Exception
+    # Expected: perform_action raises the same Exception after a single call
     mod = load_module()
 
     class FakeClient:
         def __init__(self):
-            # No initialization necessary for this fake client
-            return None
+            self.calls = 0
 
         class exceptions:
             class InvalidDBClusterStateFault(Exception):
@@ -222,25 +274,22 @@ def test_perform_action_with_retry_transient_fail(monkeypatch):
 
         def start_db_cluster(self, db_cluster_identifier=None, **kwargs):
             _ = db_cluster_identifier
+            self.calls += 1
             raise RuntimeError("always fail")
 
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier
-            return {"DBClusters": [{"Status": "starting"}]}
-
     fake = FakeClient()
-    monkeypatch.setattr(mod, "time", types.SimpleNamespace(sleep=lambda *_: None))
     try:
-        mod.perform_action_with_retry(fake, "c1", mod.ACTION_START)
+        mod.perform_action(fake.start_db_cluster, "c1")
         assert False, "should have raised"
     except Exception as exc:
         assert str(exc) == "always fail"
+    assert fake.calls == 1
 
 
-def test_perform_action_with_retry_invalid_state_fault(monkeypatch):
+def test_perform_action_invalid_state_fault(monkeypatch):
     # Objective: ensure InvalidDBClusterStateFault is not retried and is re-raised immediately
     # Setup: FakeClient.stop_db_cluster raises InvalidDBClusterStateFault
-    # Expected: perform_action_with_retry re-raises the InvalidDBClusterStateFault
+    # Expected: perform_action re-raises the InvalidDBClusterStateFault
     mod = load_module()
 
     class FakeClient:
@@ -257,9 +306,8 @@ def test_perform_action_with_retry_invalid_state_fault(monkeypatch):
             raise FakeClient.exceptions.InvalidDBClusterStateFault("bad state")
 
     fake = FakeClient()
-    monkeypatch.setattr(mod, "time", types.SimpleNamespace(sleep=lambda *_: None))
     try:
-        mod.perform_action_with_retry(fake, "c1", mod.ACTION_STOP)
+        mod.perform_action(fake.stop_db_cluster, "c1")
         assert False, "should have re-raised InvalidDBClusterStateFault"
     except Exception as exc:
         assert "bad state" in str(exc)
@@ -267,52 +315,32 @@ def test_perform_action_with_retry_invalid_state_fault(monkeypatch):
 
 def test_process_cluster_start_and_stop(monkeypatch):
     # Objective: test process_cluster handles valid start/stop transitions and marks processed
-    # Setup: Fake clients return STATUS_STOPPED or STATUS_AVAILABLE; perform_action_with_retry patched
+    # Setup: cluster dicts carry STATUS_STOPPED or STATUS_AVAILABLE; perform_action patched
     # Expected: process_cluster returns outcome 'processed' for both start and stop paths
     mod = load_module()
 
     # Start from stopped -> processed
-    class FakeClientStart:
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier
-            return {"DBClusters": [{"Status": mod.STATUS_STOPPED}]}
-
-    monkeypatch.setattr(mod, "perform_action_with_retry", lambda c, cid, action: mod.STATUS_STARTING)
-    res = mod.process_cluster(FakeClientStart(), "c1", mod.ACTION_START)
+    monkeypatch.setattr(mod, "perform_action", lambda c, cid: mod.STATUS_STARTING)
+    res = mod.process_cluster(object(), {"DBClusterIdentifier": "c1", "Status": mod.STATUS_STOPPED}, mod.ACTION_START)
     assert res["outcome"] == "processed"
 
     # Stop from available -> processed
-    class FakeClientStop:
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier
-            return {"DBClusters": [{"Status": mod.STATUS_AVAILABLE}]}
-
-    monkeypatch.setattr(mod, "perform_action_with_retry", lambda c, cid, action: mod.STATUS_STOPPING)
-    res2 = mod.process_cluster(FakeClientStop(), "c2", mod.ACTION_STOP)
+    monkeypatch.setattr(mod, "perform_action", lambda c, cid: mod.STATUS_STOPPING)
+    res2 = mod.process_cluster(object(), {"DBClusterIdentifier": "c2", "Status": mod.STATUS_AVAILABLE}, mod.ACTION_STOP)
     assert res2["outcome"] == "processed"
 
 
 def test_process_cluster_invalid_transitions(monkeypatch):
     # Objective: validate invalid state transitions are skipped with appropriate outcome
-    # Setup: Fake clients return STATUS_AVAILABLE for start and 'foo' for stop
+    # Setup: cluster dicts carry STATUS_AVAILABLE for start and 'foo' for stop
     # Expected: process_cluster returns outcome 'skipped' for invalid transitions
     mod = load_module()
 
-    class FakeClient:
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier
-            return {"DBClusters": [{"Status": mod.STATUS_AVAILABLE}]}
-
     # Attempt to start when already available -> skipped
-    res = mod.process_cluster(FakeClient(), "c1", mod.ACTION_START)
+    res = mod.process_cluster(object(), {"DBClusterIdentifier": "c1", "Status": mod.STATUS_AVAILABLE}, mod.ACTION_START)
     assert res["outcome"] == "skipped"
 
-    class FakeClient2:
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            _ = db_cluster_identifier
-            return {"DBClusters": [{"Status": "foo"}]}
-
-    res2 = mod.process_cluster(FakeClient2(), "c2", mod.ACTION_STOP)
+    res2 = mod.process_cluster(object(), {"DBClusterIdentifier": "c2", "Status": "foo"}, mod.ACTION_STOP)
     assert res2["outcome"] == "skipped"
 
 
@@ -332,7 +360,7 @@ def test_handler_end_to_end(monkeypatch):
         def __init__(self):
             self.pages = [cluster_stoppable, cluster_unstoppable, cluster_not_tagged]
 
-        def paginate(self):
+        def paginate(self, **kwargs):
             for p in self.pages:
                 yield p
 
@@ -344,13 +372,15 @@ def test_handler_end_to_end(monkeypatch):
         def get_paginator(self, name):
             return Paginator()
 
-        def list_tags_for_resource(self, resource_name=None, **kwargs):
-            _ = resource_name if resource_name is not None else kwargs.get("ResourceName")
-            if _ == "arn:1":
-                return {"TagList": [{"Key": "Schedule", "Value": "*"}]}
-            if _ == "arn:3":
-                return {"TagList": []}
-            return {"TagList": []}
+        def start_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "starting"}}
+
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
+
+        def get_resources(self, **kwargs):
+            # Only arn:1 carries the Schedule tag
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:1"}]}
 
     fake = FakeClient()
 
@@ -358,13 +388,13 @@ def test_handler_end_to_end(monkeypatch):
     monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: fake)
 
     # Patch process_cluster to return processed for c-stoppable
-    def fake_process(_, cid, action):
+    def fake_process(_, cluster, action):
+        cid = cluster["DBClusterIdentifier"]
         if cid == "c-stoppable":
             return {"cluster_id": cid, "outcome": "processed", "message": "ok", "status": "starting"}
         return {"cluster_id": cid, "outcome": "failed", "message": "bad", "status": ""}
 
     monkeypatch.setattr(mod, "process_cluster", fake_process)
-    monkeypatch.setattr(mod, "time", types.SimpleNamespace(sleep=lambda *_: None))
 
     out = mod.handler({"Action": "Stop", "ScheduleTagKey": "Schedule"}, None)
     assert out["ProcessedClusters"] == ["c-stoppable"]
@@ -375,7 +405,7 @@ def test_handler_end_to_end(monkeypatch):
 def test_handler_multiple_discovered_clusters(monkeypatch):
     # Objective: ensure handler picks up multiple clusters returned by the paginator
     # Setup: paginator yields a single page with three stoppable+tagged clusters
-    # Expected: all three cluster ids appear in ProcessedClusters when process_cluster returns processed
+    # Expected: all three cluster ids appear in ProcessedClusters, in discovery order
     mod = load_module()
 
     cluster_a = {"DBClusters": [{"DBClusterIdentifier": "a", "EngineMode": "provisioned", "DBClusterArn": "arn:a"}]}
@@ -383,47 +413,539 @@ def test_handler_multiple_discovered_clusters(monkeypatch):
     cluster_c = {"DBClusters": [{"DBClusterIdentifier": "c", "EngineMode": "provisioned", "DBClusterArn": "arn:c"}]}
 
     class Paginator:
-        def paginate(self):
+        def paginate(self, **kwargs):
             yield {"DBClusters": [cluster_a["DBClusters"][0], cluster_b["DBClusters"][0], cluster_c["DBClusters"][0]]}
 
     class FakeClient:
         def get_paginator(self, name):
             return Paginator()
 
-        def list_tags_for_resource(self, resource_name=None, **kwargs):
-            return {"TagList": [{"Key": "Schedule", "Value": "*"}]}
+        def start_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "starting"}}
+
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:a"}, {"ResourceARN": "arn:b"}, {"ResourceARN": "arn:c"}]}
 
     fake = FakeClient()
     monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: fake)
 
-    # Patch process_cluster to mark everything processed
-    monkeypatch.setattr(mod, "process_cluster", lambda c, cid, action: {"cluster_id": cid, "outcome": "processed", "message": "ok", "status": "starting"})
-    monkeypatch.setattr(mod, "time", types.SimpleNamespace(sleep=lambda *_: None))
+    # Patch process_cluster to mark everything processed; earlier clusters finish last
+    import time
+
+    delays = {"a": 0.2, "b": 0.1, "c": 0.0}
+
+    def fake_process(c, cluster, action):
+        cid = cluster["DBClusterIdentifier"]
+        time.sleep(delays[cid])
+        return {"cluster_id": cid, "outcome": "processed", "message": "ok", "status": "starting"}
+
+    monkeypatch.setattr(mod, "process_cluster", fake_process)
 
     out = mod.handler({"Action": "Start", "ScheduleTagKey": "Schedule"}, None)
-    assert set(out["ProcessedClusters"]) == {"a", "b", "c"}
+    assert out["ProcessedClusters"] == ["a", "b", "c"]
 
 
-def test_process_cluster_with_multiple_describe_entries(monkeypatch):
-    # Objective: show process_cluster uses the first entry from describe_db_clusters
-    # Setup: FakeClient.describe_db_clusters returns multiple DBClusters with differing statuses
-    # Expected: only the first entry's status determines the action decision
+def test_handler_falls_back_to_per_cluster_tags(monkeypatch, caplog):
+    # Objective: ensure the ListTagsForResource fallback only processes tagged clusters
+    # Setup: get_resources raises; list_tags_for_resource tags 'a' and 'c' but not 'b'
+    # Expected: only 'a' and 'c' are processed and logged as eligible; 'b' appears in no output list
+    import logging
+
     mod = load_module()
 
-    class FakeClientFirstAvailable:
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            # First entry is available, others are stopped -> start should be skipped
-            return {"DBClusters": [{"Status": mod.STATUS_AVAILABLE}, {"Status": mod.STATUS_STOPPED}, {"Status": mod.STATUS_STOPPED}]}
+    tags = {"arn:a": [{"Key": "Schedule", "Value": "*"}], "arn:b": [], "arn:c": [{"Key": "Schedule", "Value": "*"}]}
+    processed_ids = []
 
-    res = mod.process_cluster(FakeClientFirstAvailable(), "c1", mod.ACTION_START)
-    assert res["outcome"] == "skipped"
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": [
+                {"DBClusterIdentifier": cid, "EngineMode": "provisioned", "DBClusterArn": f"arn:{cid}", "Status": "available"}
+                for cid in ("a", "b", "c")
+            ]}
 
-    class FakeClientFirstStopped:
-        def describe_db_clusters(self, db_cluster_identifier=None, **kwargs):
-            # First entry is stopped, others available -> start should proceed (processed)
-            return {"DBClusters": [{"Status": mod.STATUS_STOPPED}, {"Status": mod.STATUS_AVAILABLE}, {"Status": mod.STATUS_AVAILABLE}]}
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
 
-    # Patch perform_action_with_retry to avoid actual API calls
-    monkeypatch.setattr(mod, "perform_action_with_retry", lambda c, cid, action: mod.STATUS_STARTING)
-    res2 = mod.process_cluster(FakeClientFirstStopped(), "c2", mod.ACTION_START)
-    assert res2["outcome"] == "processed"
+        def get_resources(self, **kwargs):
+            raise RuntimeError("tagging API unavailable")
+
+        def list_tags_for_resource(self, ResourceName=None, **kwargs):
+            return {"TagList": tags[ResourceName]}
+
+        def stop_db_cluster(self, DBClusterIdentifier=None, **kwargs):
+            processed_ids.append(DBClusterIdentifier)
+            return {"DBCluster": {"Status": "stopping"}}
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+
+    with caplog.at_level(logging.INFO):
+        out = mod.handler({"Action": "Stop"}, None)
+    assert out == {"ProcessedClusters": ["a", "c"], "SkippedClusters": [], "FailedClusters": []}
+    assert sorted(processed_ids) == ["a", "c"]
+    assert "Found 2 eligible clusters: ['a', 'c']" in [r.getMessage() for r in caplog.records]
+
+
+def test_process_cluster_uses_discovered_status(monkeypatch):
+    # Objective: ensure process_cluster decides from the discovered cluster dict without re-describing
+    # Setup: client whose describe_db_clusters fails the test if called; cluster dict is 'stopped'
+    # Expected: start proceeds (processed) and describe_db_clusters is never called
+    mod = load_module()
+
+    class NoDescribeClient:
+        def describe_db_clusters(self, **kwargs):
+            raise AssertionError("describe_db_clusters should not be called")
+
+    monkeypatch.setattr(mod, "perform_action", lambda c, cid: mod.STATUS_STARTING)
+    res = mod.process_cluster(NoDescribeClient(), {"DBClusterIdentifier": "c1", "Status": mod.STATUS_STOPPED}, mod.ACTION_START)
+    assert res["outcome"] == "processed"
+    assert res["cluster_id"] == "c1"
+    assert res["status"] == mod.STATUS_STARTING
+
+
+def test_handler_filters_discovery_to_aurora_engines(monkeypatch):
+    # Objective: ensure discovery asks DescribeDBClusters to return Aurora engines only
+    # Setup: paginator records the kwargs it is called with; no clusters returned
+    # Expected: paginate receives an 'engine' filter with the Aurora engine names
+    mod = load_module()
+
+    calls = []
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            calls.append(kwargs)
+            yield {"DBClusters": []}
+
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
+
+        def start_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "starting"}}
+
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": []}
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+    mod.handler({"Action": "Stop"}, None)
+
+    assert calls == [{"Filters": [{"Name": "engine", "Values": mod.AURORA_ENGINES}]}]
+
+
+class StatefulRdsClient:
+    """Fake RDS client whose single cluster changes Status as actions are issued."""
+
+    class exceptions:
+        class InvalidDBClusterStateFault(Exception):
+            pass
+
+    def __init__(self, status):
+        self.status = status
+        self.paginate_calls = 0
+        self.action_calls = []
+
+    def get_paginator(self, name):
+        client = self
+
+        class Paginator:
+            def paginate(self, **kwargs):
+                client.paginate_calls += 1
+                yield {"DBClusters": [{
+                    "DBClusterIdentifier": "a", "EngineMode": "provisioned",
+                    "DBClusterArn": "arn:a", "Status": client.status,
+                }]}
+
+        return Paginator()
+
+    def get_resources(self, **kwargs):
+        return {"ResourceTagMappingList": [{"ResourceARN": "arn:a"}]}
+
+    def _transition(self, required, new_status, name):
+        self.action_calls.append(name)
+        if self.status != required:
+            raise self.exceptions.InvalidDBClusterStateFault(f"cluster is {self.status}")
+        self.status = new_status
+        return {"DBCluster": {"Status": new_status}}
+
+    def stop_db_cluster(self, **kwargs):
+        return self._transition("available", "stopping", "stop")
+
+    def start_db_cluster(self, **kwargs):
+        return self._transition("stopped", "starting", "start")
+
+
+def test_handler_reuses_clients_across_invocations(monkeypatch):
+    # Objective: ensure warm invocations reuse clients but always re-discover clusters
+    # Setup: boto3.client patched to count client creation; handler invoked twice
+    # Expected: clients are built once per service; the paginator runs on every invocation
+    mod = load_module()
+
+    fake = StatefulRdsClient("stopped")
+    created = []
+
+    def fake_client(service, **kwargs):
+        created.append(service)
+        return fake
+
+    monkeypatch.setattr(mod.boto3, "client", fake_client)
+
+    mod.handler({"Action": "Stop"}, None)
+    mod.handler({"Action": "Stop"}, None)
+    assert fake.paginate_calls == 2
+    assert sorted(created) == ["rds", "resourcegroupstaggingapi"]
+
+
+def test_handler_stop_then_stop_skips_second_run(monkeypatch):
+    # Objective: ensure a repeated Stop reads the live status rather than a stale discovery
+    # Setup: stateful fake cluster starts 'available'; handler invoked with Stop twice back to back
+    # Expected: first run processes, second run skips ('stopping') without calling StopDBCluster again
+    mod = load_module()
+
+    fake = StatefulRdsClient("available")
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: fake)
+
+    first = mod.handler({"Action": "Stop"}, None)
+    second = mod.handler({"Action": "Stop"}, None)
+    assert first["ProcessedClusters"] == ["a"]
+    assert second["SkippedClusters"] == ["a"]
+    assert second["FailedClusters"] == []
+    assert fake.action_calls == ["stop"]
+
+
+def test_handler_stop_then_start_does_not_trust_stale_status(monkeypatch):
+    # Objective: ensure Start after Stop sees the cluster is stopping, not the earlier 'available'
+    # Setup: stateful fake cluster starts 'available'; handler invoked with Stop then Start
+    # Expected: Start skips with a "Cannot start from 'stopping'" message, not "Already 'available'"
+    mod = load_module()
+
+    fake = StatefulRdsClient("available")
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: fake)
+    results = []
+    real_process = mod.process_cluster
+
+    def recording_process(*args):
+        result = real_process(*args)
+        results.append(result)
+        return result
+
+    monkeypatch.setattr(mod, "process_cluster", recording_process)
+
+    mod.handler({"Action": "Stop"}, None)
+    out = mod.handler({"Action": "Start"}, None)
+    assert out["SkippedClusters"] == ["a"]
+    assert results[-1]["status"] == "stopping"
+    assert "Cannot start from 'stopping'" in results[-1]["message"]
+    assert fake.action_calls == ["stop"]
+
+
+def test_handler_processes_clusters_while_paginating(monkeypatch):
+    # Objective: ensure clusters from an earlier page are processed before later pages are fetched
+    # Setup: paginator waits for page one's cluster to be processed before yielding page two
+    # Expected: processing overlapped pagination and both clusters are processed
+    import threading
+
+    mod = load_module()
+
+    first_processed = threading.Event()
+    overlapped = []
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": [{"DBClusterIdentifier": "a", "EngineMode": "provisioned", "DBClusterArn": "arn:a"}]}
+            overlapped.append(first_processed.wait(timeout=5))
+            yield {"DBClusters": [{"DBClusterIdentifier": "b", "EngineMode": "provisioned", "DBClusterArn": "arn:b"}]}
+
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
+
+        def start_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "starting"}}
+
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:a"}, {"ResourceARN": "arn:b"}]}
+
+    def fake_process(_, cluster, action):
+        cid = cluster["DBClusterIdentifier"]
+        if cid == "a":
+            first_processed.set()
+        return {"cluster_id": cid, "outcome": "processed", "message": "ok", "status": "stopping"}
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+    monkeypatch.setattr(mod, "process_cluster", fake_process)
+
+    out = mod.handler({"Action": "Stop"}, None)
+    assert overlapped == [True]
+    assert out["ProcessedClusters"] == ["a", "b"]
+
+
+def test_handler_logs_one_json_record_per_cluster(monkeypatch, caplog):
+    # Objective: ensure each cluster outcome is logged as a single structured JSON record
+    # Setup: one tagged 'available' cluster whose StopDBCluster call raises
+    # Expected: exactly one JSON record is logged for the cluster, at ERROR level
+    import json
+    import logging
+
+    mod = load_module()
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": [{
+                "DBClusterIdentifier": "a", "EngineMode": "provisioned",
+                "DBClusterArn": "arn:a", "Status": "available",
+            }]}
+
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:a"}]}
+
+        def stop_db_cluster(self, **kwargs):
+            raise RuntimeError("bad")
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+
+    with caplog.at_level(logging.INFO):
+        out = mod.handler({"Action": "Stop"}, None)
+    assert out["FailedClusters"] == ["a"]
+
+    records = [r for r in caplog.records if r.getMessage().startswith("{")]
+    assert len(records) == 1
+    assert records[0].levelno == logging.ERROR
+    assert json.loads(records[0].getMessage()) == {
+        "cluster": "a", "action": "stop", "status": "available", "outcome": "failed", "message": "bad",
+    }
+
+
+def test_log_level_env_var_suppresses_info_records(monkeypatch, caplog):
+    # Objective: ensure LOG_LEVEL raises the logger level and skips building INFO records
+    # Setup: LOG_LEVEL=WARNING at import; one tagged cluster processed successfully; json.dumps patched
+    # Expected: logger level is WARNING and json.dumps is never called for the INFO outcome
+    import logging
+
+    # caplog restores the root logger level at teardown
+    caplog.set_level(logging.INFO)
+    monkeypatch.setenv("LOG_LEVEL", "warning")
+    mod = load_module()
+    assert mod.logger.level == logging.WARNING
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": [{
+                "DBClusterIdentifier": "a", "EngineMode": "provisioned",
+                "DBClusterArn": "arn:a", "Status": "stopped",
+            }]}
+
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:a"}]}
+
+        def start_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "starting"}}
+
+    def fail_dumps(*args, **kwargs):
+        raise AssertionError("json.dumps should not be called when INFO is disabled")
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+    monkeypatch.setattr(mod, "json", SimpleNamespace(dumps=fail_dumps))
+
+    out = mod.handler({"Action": "Start"}, None)
+    assert out["ProcessedClusters"] == ["a"]
+
+
+def test_handler_reports_submitted_clusters_when_later_page_fails(monkeypatch, caplog):
+    # Objective: ensure clusters actioned before a pagination failure are still collected and logged
+    # Setup: page one yields an 'available' tagged cluster; fetching page two raises
+    # Expected: the cluster is stopped, its JSON record and the summary are logged, then the error propagates
+    import json
+    import logging
+
+    mod = load_module()
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": [{
+                "DBClusterIdentifier": "a", "EngineMode": "provisioned",
+                "DBClusterArn": "arn:a", "Status": "available",
+            }]}
+            raise RuntimeError("throttled")
+
+    class FakeClient:
+        def __init__(self):
+            self.stopped = []
+
+        def get_paginator(self, name):
+            return Paginator()
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": [{"ResourceARN": "arn:a"}]}
+
+        def stop_db_cluster(self, **kwargs):
+            self.stopped.append(kwargs["DBClusterIdentifier"])
+            return {"DBCluster": {"Status": "stopping"}}
+
+    fake = FakeClient()
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: fake)
+
+    with caplog.at_level(logging.INFO):
+        try:
+            mod.handler({"Action": "Stop"}, None)
+            assert False, "should have re-raised the discovery error"
+        except RuntimeError as exc:
+            assert str(exc) == "throttled"
+
+    assert fake.stopped == ["a"]
+    messages = [r.getMessage() for r in caplog.records]
+    records = [json.loads(m) for m in messages if m.startswith("{")]
+    assert records == [{
+        "cluster": "a", "action": "stop", "status": "stopping", "outcome": "processed",
+        "message": "Action 'stop' initiated successfully.",
+    }]
+    assert any(m.startswith("Done. Action=stop | Processed=1") for m in messages)
+
+
+def test_unknown_log_level_falls_back_to_info(monkeypatch, caplog):
+    # Objective: ensure an unrecognised LOG_LEVEL doesn't break import and falls back to INFO
+    # Setup: LOG_LEVEL=VERBOSE at import
+    # Expected: module loads, logger level is INFO, and a warning names the bad value
+    import logging
+
+    caplog.set_level(logging.WARNING)
+    monkeypatch.setenv("LOG_LEVEL", "VERBOSE")
+    mod = load_module()
+
+    assert mod.logger.level == logging.INFO
+    assert any("VERBOSE" in r.getMessage() for r in caplog.records)
+
+
+def test_handler_applies_log_level_from_event(monkeypatch, caplog):
+    # Objective: ensure the document's LogLevel input sets the level for the run
+    # Setup: handler invoked with LogLevel 'warning' and no clusters discovered
+    # Expected: logger level is WARNING after the call
+    import logging
+
+    caplog.set_level(logging.INFO)
+    mod = load_module()
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": []}
+
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
+
+        def get_resources(self, **kwargs):
+            return {"ResourceTagMappingList": []}
+
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+    mod.handler({"Action": "Stop", "LogLevel": "warning"}, None)
+    assert mod.logger.level == logging.WARNING
+
+
+def test_handler_log_level_does_not_leak_between_invocations(monkeypatch, caplog):
+    # Objective: ensure one run's LogLevel does not carry over to the next warm invocation
+    # Setup: handler invoked with LogLevel 'WARNING', then again without LogLevel (LOG_LEVEL unset)
+    # Expected: the first run logs no INFO outcome record; the second is back at INFO and logs one
+    import json
+    import logging
+
+    caplog.set_level(logging.INFO)
+    monkeypatch.delenv("LOG_LEVEL", raising=False)
+    mod = load_module()
+
+    fake = StatefulRdsClient("stopped")
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: fake)
+
+    def outcome_records():
+        return [json.loads(r.getMessage()) for r in caplog.records if r.getMessage().startswith("{")]
+
+    mod.handler({"Action": "Stop", "LogLevel": "WARNING"}, None)
+    assert mod.logger.level == logging.WARNING
+    assert outcome_records() == []
+
+    mod.handler({"Action": "Stop"}, None)
+    assert mod.logger.level == logging.INFO
+    assert [r["outcome"] for r in outcome_records()] == ["skipped"]
+
+
+def test_resolve_log_level_matches_terraform_allowed_values(monkeypatch):
+    # Objective: ensure the script accepts exactly the levels main.tf and variables.tf allow
+    # Setup: read the LogLevel allowedValues from main.tf and the aurora_log_level validation list
+    # Expected: all three lists are identical; CRITICAL falls back to INFO
+    import re
+
+    mod = load_module()
+    root = pathlib.Path(mod.__file__).resolve().parent.parent
+
+    main_tf = (root / "main.tf").read_text()
+    variables_tf = (root / "variables.tf").read_text()
+    document_values = re.search(r'LogLevel = \{[^}]*allowedValues = \[([^\]]*)\]', main_tf).group(1)
+    variable_values = re.search(r'contains\(\[([^\]]*)\], var\.aurora_log_level\)', variables_tf).group(1)
+
+    def parse(values):
+        return tuple(v.strip().strip('"') for v in values.split(","))
+
+    assert parse(document_values) == mod.LOG_LEVELS
+    assert parse(variable_values) == mod.LOG_LEVELS
+    assert mod.resolve_log_level("critical") == "INFO"
+
+
+def test_handler_fallback_discovery_failure_counts_only_eligible(monkeypatch, caplog):
+    # Objective: ensure a pagination failure in fallback mode reports eligible clusters, not all stoppable ones
+    # Setup: get_resources raises; page one has tagged 'a' and untagged 'b'; fetching page two raises
+    # Expected: 'a' is stopped and the error log counts one eligible cluster before the error propagates
+    import logging
+
+    mod = load_module()
+
+    class Paginator:
+        def paginate(self, **kwargs):
+            yield {"DBClusters": [
+                {"DBClusterIdentifier": cid, "EngineMode": "provisioned", "DBClusterArn": f"arn:{cid}", "Status": "available"}
+                for cid in ("a", "b")
+            ]}
+            raise RuntimeError("throttled")
+
+    class FakeClient:
+        def get_paginator(self, name):
+            return Paginator()
+
+        def get_resources(self, **kwargs):
+            raise RuntimeError("tagging API unavailable")
+
+        def list_tags_for_resource(self, ResourceName=None, **kwargs):
+            return {"TagList": [{"Key": "Schedule", "Value": "*"}] if ResourceName == "arn:a" else []}
+
+        def stop_db_cluster(self, **kwargs):
+            return {"DBCluster": {"Status": "stopping"}}
+
+    monkeypatch.setattr(mod.boto3, "client", lambda *args, **kwargs: FakeClient())
+
+    with caplog.at_level(logging.INFO):
+        try:
+            mod.handler({"Action": "Stop"}, None)
+            assert False, "should have re-raised the discovery error"
+        except RuntimeError as exc:
+            assert str(exc) == "throttled"
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Found 1 eligible clusters: ['a']" in messages
+    assert "Cluster discovery failed after 1 eligible clusters were found: throttled" in messages
@@ -131,6 +131,17 @@ variable "stop_aurora_minute" {
   }
 }
 
+variable "aurora_log_level" {
+  description = "Log level for the Aurora cluster scheduler script. WARNING logs only warnings and failed clusters."
+  type        = string
+  default     = "INFO"
+
+  validation {
+    condition     = contains(["DEBUG", "INFO", "WARNING", "ERROR"], var.aurora_log_level)
+    error_message = "aurora_log_level must be one of DEBUG, INFO, WARNING, ERROR."
+  }
+}
+
 variable "tags" {
   description = "Tags to apply to resources created by this module."
   type        = map(string)